@@ -43,7 +43,9 @@ This program expects an input directory that contains the following files.
       global_row: the global row indicies contained in the shard
       global_col: the global column indicies contained in the shard
       sparse_local_row, sparse_local_col, sparse_value: three parallel arrays
-      that are a sparse representation of the submatrix counts.
+      that are a sparse representation of the submatrix counts, each stored
+      as a single bytes value with the raw little-endian int32, int32 and
+      float32 data.
 
 It will generate embeddings, training from the input directory for
 the specified number of epochs.  When complete, it will output the trained
@@ -129,17 +131,17 @@ def count_matrix_input(filenames, submatrix_rows, submatrix_cols):
         features={
             "global_row": tf.FixedLenFeature([submatrix_rows], dtype=tf.int64),
             "global_col": tf.FixedLenFeature([submatrix_cols], dtype=tf.int64),
-            "sparse_local_row": tf.VarLenFeature(dtype=tf.int64),
-            "sparse_local_col": tf.VarLenFeature(dtype=tf.int64),
-            "sparse_value": tf.VarLenFeature(dtype=tf.float32)
+            "sparse_local_row": tf.FixedLenFeature([], dtype=tf.string),
+            "sparse_local_col": tf.FixedLenFeature([], dtype=tf.string),
+            "sparse_value": tf.FixedLenFeature([], dtype=tf.string)
         })
 
     global_row = features["global_row"]
     global_col = features["global_col"]
 
-    sparse_local_row = features["sparse_local_row"].values
-    sparse_local_col = features["sparse_local_col"].values
-    sparse_count = features["sparse_value"].values
+    sparse_local_row = tf.decode_raw(features["sparse_local_row"], tf.int32)
+    sparse_local_col = tf.decode_raw(features["sparse_local_col"], tf.int32)
+    sparse_count = tf.decode_raw(features["sparse_value"], tf.float32)
 
     sparse_indices = tf.concat(axis=1, values=[tf.expand_dims(sparse_local_row, 1),
                                                tf.expand_dims(sparse_local_col, 1)])
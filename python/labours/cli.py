@@ -1,12 +1,8 @@
 import argparse
 from argparse import Namespace
 import os
-import subprocess
 import sys
 import time
-from typing import List
-
-import numpy
 
 from labours.cors_web_server import web_server
 from labours.embeddings import train_embeddings, write_embeddings
@@ -26,16 +22,6 @@ from labours.utils import import_pandas
 DEFAULT_MATPLOTLIB_BACKEND = None
 
 
-def list_matplotlib_styles() -> List[str]:
-    script = (
-        "import sys; from matplotlib import pyplot; "
-        "sys.stdout.write(repr(pyplot.style.available))"
-    )
-    styles = eval(subprocess.check_output([sys.executable, "-c", script]))
-    styles.remove("classic")
-    return ["default", "classic"] + styles
-
-
 def parse_args() -> Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -58,8 +44,8 @@ def parse_args() -> Namespace:
     parser.add_argument(
         "--style",
         default="ggplot",
-        choices=list_matplotlib_styles(),
-        help="Plot style to use.",
+        help="Plot style to use: \"default\", \"classic\" or any other Matplotlib "
+        "style, e.g. \"bmh\", or a path to a .mplstyle file.",
     )
     parser.add_argument(
         "--backend",
@@ -242,12 +228,13 @@ def main() -> None:
             people, matrix = load_overwrites_matrix(
                 *reader.get_people_interaction(), max_people=1000000, normalize=False
             )
-            from scipy.sparse import csr_matrix
+            from scipy.sparse import csr_matrix, diags
 
-            matrix = matrix[:, 1:]
-            matrix = numpy.triu(matrix) + numpy.tril(matrix).T
+            matrix = csr_matrix(matrix[:, 1:])
+            # symmetrize without dense temporaries; the diagonal is counted twice, the same
+            # as the upper triangle of the two halves added together and then mirrored
             matrix = matrix + matrix.T
-            matrix = csr_matrix(matrix)
+            matrix = matrix + diags(matrix.diagonal())
             try:
                 write_embeddings(
                     "overwrites",
@@ -1,6 +1,13 @@
+from http.server import HTTPServer, SimpleHTTPRequestHandler, test
 import threading
 
 
+class CORSRequestHandler(SimpleHTTPRequestHandler):
+    def end_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        SimpleHTTPRequestHandler.end_headers(self)
+
+
 class CORSWebServer(object):
     def __init__(self) -> None:
         self.thread = threading.Thread(target=self.serve)
@@ -9,18 +16,11 @@ class CORSWebServer(object):
     def serve(self):
         outer = self
 
-        from http.server import HTTPServer, SimpleHTTPRequestHandler, test
-
         class ClojureServer(HTTPServer):
             def __init__(self, *args, **kwargs):
                 HTTPServer.__init__(self, *args, **kwargs)
                 outer.server = self
 
-        class CORSRequestHandler(SimpleHTTPRequestHandler):
-            def end_headers(self):
-                self.send_header("Access-Control-Allow-Origin", "*")
-                SimpleHTTPRequestHandler.end_headers(self)
-
         test(CORSRequestHandler, ClojureServer)
 
     def start(self) -> None:
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+import csv
 import os
 import shutil
 import sys
@@ -8,6 +10,7 @@ import numpy
 from scipy.sparse.csr import csr_matrix
 
 from labours.cors_web_server import web_server
+from labours.utils import import_pandas
 
 IDEAL_SHARD_SIZE = 4096
 
@@ -17,14 +20,15 @@ def train_embeddings(
     matrix: csr_matrix,
     tmpdir: None,
     shard_size: int = IDEAL_SHARD_SIZE,
-) -> Tuple[List[Tuple[str, numpy.int64]], List[numpy.ndarray]]:
+) -> Tuple[List[Tuple[str, numpy.int64]], numpy.ndarray]:
     import tensorflow as tf
     from labours._vendor import swivel
 
     assert matrix.shape[0] == matrix.shape[1]
     assert len(index) <= matrix.shape[0]
-    outlier_threshold = numpy.percentile(matrix.data, 99)
-    matrix.data[matrix.data > outlier_threshold] = outlier_threshold
+    # integer counts are clipped to the truncated percentile
+    outlier_threshold = matrix.dtype.type(numpy.percentile(matrix.data, 99))
+    numpy.minimum(matrix.data, outlier_threshold, out=matrix.data)
     nshards = len(index) // shard_size
     if nshards * shard_size < len(index):
         nshards += 1
@@ -33,69 +37,76 @@ def train_embeddings(
     remainder = len(index) - nshards * shard_size
     if remainder > 0:
         lengths = matrix.indptr[1:] - matrix.indptr[:-1]
-        filtered = sorted(numpy.argsort(lengths)[remainder:])
-    else:
-        filtered = list(range(len(index)))
-    if len(filtered) < matrix.shape[0]:
+        filtered = numpy.sort(numpy.argpartition(lengths, remainder)[remainder:])
         print("Truncating the sparse matrix...")
         matrix = matrix[filtered, :][:, filtered]
-    meta_index = []
-    for i, j in enumerate(filtered):
-        meta_index.append((index[j], matrix[i, i]))
-    index = [mi[0] for mi in meta_index]
+        index = [index[j] for j in filtered]
+    elif len(index) < matrix.shape[0]:
+        print("Truncating the sparse matrix...")
+        matrix = matrix[: len(index), : len(index)]
+    meta_index = list(zip(index, matrix.diagonal().tolist()))
     with tempfile.TemporaryDirectory(
         prefix="hercules_labours_", dir=tmpdir or None
     ) as tmproot:
-        print("Writing Swivel metadata...")
-        vocabulary = "\n".join(index)
-        with open(os.path.join(tmproot, "row_vocab.txt"), "w") as out:
-            out.write(vocabulary)
-        with open(os.path.join(tmproot, "col_vocab.txt"), "w") as out:
-            out.write(vocabulary)
-        del vocabulary
         bool_sums = matrix.indptr[1:] - matrix.indptr[:-1]
-        bool_sums_str = "\n".join(map(str, bool_sums.tolist()))
-        with open(os.path.join(tmproot, "row_sums.txt"), "w") as out:
-            out.write(bool_sums_str)
-        with open(os.path.join(tmproot, "col_sums.txt"), "w") as out:
-            out.write(bool_sums_str)
-        del bool_sums_str
         reorder = numpy.argsort(-bool_sums)
 
-        print("Writing Swivel shards...")
-        for row in range(nshards):
-            for col in range(nshards):
+        # shard i holds reorder[i::nshards], so reorder[j] goes to shard j % nshards
+        # at the local position j // nshards; group all the nonzeros by shard at once
+        blocks = reorder.reshape(shard_size, nshards).T
+        positions = numpy.empty_like(reorder)
+        positions[reorder] = numpy.arange(len(reorder))
+        coo = matrix.tocoo()
+        rows, cols = positions[coo.row], positions[coo.col]
+        shard_ids = (rows % nshards) * nshards + cols % nshards
+        order = numpy.argsort(shard_ids, kind="stable")
+        bounds = numpy.searchsorted(
+            shard_ids[order], numpy.arange(nshards * nshards + 1)
+        )
+        local_rows, local_cols = (rows // nshards)[order], (cols // nshards)[order]
+        values = coo.data[order]
+        del coo, rows, cols, shard_ids, order
 
-                def _int64s(xs):
-                    return tf.train.Feature(
-                        int64_list=tf.train.Int64List(value=list(xs))
-                    )
-
-                def _floats(xs):
-                    return tf.train.Feature(
-                        float_list=tf.train.FloatList(value=list(xs))
-                    )
-
-                indices_row = reorder[row::nshards]
-                indices_col = reorder[col::nshards]
-                shard = matrix[indices_row][:, indices_col].tocoo()
-
-                example = tf.train.Example(
-                    features=tf.train.Features(
-                        feature={
-                            "global_row": _int64s(indices_row),
-                            "global_col": _int64s(indices_col),
-                            "sparse_local_row": _int64s(shard.row),
-                            "sparse_local_col": _int64s(shard.col),
-                            "sparse_value": _floats(shard.data),
-                        }
-                    )
-                )
+        def _int64s(xs):
+            return tf.train.Feature(int64_list=tf.train.Int64List(value=xs.tolist()))
+
+        # the global indices are the same for every shard in a row or a column
+        block_features = [_int64s(block) for block in blocks]
+
+        def write_shards(row):
+            # every shard in the row overwrites the same fields of one Example
+            example = tf.train.Example()
+            feature = example.features.feature
+            feature["global_row"].CopyFrom(block_features[row])
+            for col in range(nshards):
+                i = row * nshards + col
+                shard = slice(bounds[i], bounds[i + 1])
+                feature["global_col"].CopyFrom(block_features[col])
+                for key, xs, dtype in (
+                    ("sparse_local_row", local_rows, "<i4"),
+                    ("sparse_local_col", local_cols, "<i4"),
+                    ("sparse_value", values, "<f4"),
+                ):
+                    feature[key].bytes_list.value[:] = [
+                        xs[shard].astype(dtype).tobytes()
+                    ]
 
                 with open(
                     os.path.join(tmproot, "shard-%03d-%03d.pb" % (row, col)), "wb"
                 ) as out:
                     out.write(example.SerializeToString())
+
+        print("Writing Swivel shards...")
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            shards = executor.map(write_shards, range(nshards))
+            print("Writing Swivel metadata...")
+            with open(os.path.join(tmproot, "row_vocab.txt"), "w") as out:
+                out.writelines(name + "\n" for name in index)
+            _link_or_copy(tmproot, "row_vocab.txt", "col_vocab.txt")
+            numpy.savetxt(os.path.join(tmproot, "row_sums.txt"), bool_sums, fmt="%d")
+            _link_or_copy(tmproot, "row_sums.txt", "col_sums.txt")
+            # list() re-raises the exceptions from the workers
+            list(shards)
         print("Training Swivel model...")
         swivel.FLAGS.submatrix_rows = shard_size
         swivel.FLAGS.submatrix_cols = shard_size
@@ -137,26 +148,48 @@ def train_embeddings(
         swivel.main(None)
         sys.argv.extend(argv_backup)
         print("Reading Swivel embeddings...")
-        embeddings = []
-        with open(os.path.join(tmproot, "row_embedding.tsv")) as frow:
-            with open(os.path.join(tmproot, "col_embedding.tsv")) as fcol:
-                for i, (lrow, lcol) in enumerate(zip(frow, fcol)):
-                    prow, pcol = (l.split("\t", 1) for l in (lrow, lcol))
-                    assert prow[0] == pcol[0]
-                    erow, ecol = (
-                        numpy.fromstring(p[1], dtype=numpy.float32, sep="\t")
-                        for p in (prow, pcol)
-                    )
-                    embeddings.append((erow + ecol) / 2)
+        row_names, row_embeddings = _read_swivel_embeddings(
+            os.path.join(tmproot, "row_embedding.tsv")
+        )
+        col_names, col_embeddings = _read_swivel_embeddings(
+            os.path.join(tmproot, "col_embedding.tsv")
+        )
+        assert (row_names == col_names).all()
+        # average in place, the row buffer is not needed anymore
+        embeddings = numpy.add(row_embeddings, col_embeddings, out=row_embeddings)
+        embeddings *= 0.5
     return meta_index, embeddings
 
 
+def _link_or_copy(root: str, src: str, dst: str) -> None:
+    src, dst = os.path.join(root, src), os.path.join(root, dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # the file system does not support hard links
+        shutil.copyfile(src, dst)
+
+
+def _read_swivel_embeddings(path: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    pandas = import_pandas()
+
+    table = pandas.read_csv(
+        path,
+        sep="\t",
+        header=None,
+        dtype={0: str},
+        quoting=csv.QUOTE_NONE,
+        na_filter=False,
+    )
+    return table[0].values, table.iloc[:, 1:].values.astype(numpy.float32)
+
+
 def write_embeddings(
     name: str,
     output: str,
     run_server: bool,
     index: List[Tuple[str, numpy.int64]],
-    embeddings: List[numpy.ndarray],
+    embeddings: numpy.ndarray,
 ) -> None:
     print("Writing Tensorflow Projector files...")
     if not output:
@@ -167,14 +200,11 @@ def write_embeddings(
     metaf = "%s_%s_meta.tsv" % (output, name)
     with open(metaf, "w") as fout:
         fout.write("name\tcommits\n")
-        for pair in index:
-            fout.write("%s\t%s\n" % pair)
+        fout.writelines("%s\t%s\n" % pair for pair in index)
     print("Wrote", metaf)
     dataf = "%s_%s_data.tsv" % (output, name)
     with open(dataf, "w") as fout:
-        for vec in embeddings:
-            fout.write("\t".join(str(v) for v in vec))
-            fout.write("\n")
+        numpy.savetxt(fout, embeddings, fmt="%.7g", delimiter="\t")
     print("Wrote", dataf)
     jsonf = "%s_%s.json" % (output, name)
     with open(jsonf, "w") as fout:
@@ -190,7 +220,7 @@ def write_embeddings(
   ]
 }
 """
-            % (output, name, len(embeddings), len(embeddings[0]), dataf, metaf)
+            % (output, name, embeddings.shape[0], embeddings.shape[1], dataf, metaf)
         )
     print("Wrote %s" % jsonf)
     if run_server and not web_server.running:
@@ -1,8 +1,11 @@
 from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
 import contextlib
 from datetime import datetime, timedelta
 import io
-import json
+from itertools import repeat
+import multiprocessing
+import os
 import sys
 from typing import List, Tuple, TYPE_CHECKING
 import warnings
@@ -10,8 +13,21 @@ import warnings
 import numpy
 import tqdm
 
-from labours.plotting import apply_plot_style, deploy_plot, get_plot_path, import_pyplot
-from labours.utils import default_json, floor_datetime, import_pandas, parse_date
+from labours.plotting import (
+    apply_plot_style,
+    deploy_plot,
+    get_plot_path,
+    get_time_ticks,
+    import_pyplot,
+)
+from labours.utils import dump_json, floor_timestamp, import_pandas, parse_date
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # the interpolation of the burndown matrices stays correct but becomes much slower
+    njit = None
+    prange = range
 
 if TYPE_CHECKING:
     from lifelines import KaplanMeierFitter
@@ -39,16 +55,16 @@ def plot_burndown(
             if target == "project":
                 name = "project"
             output = get_plot_path(args.output, name)
-        with open(output, "w") as fout:
-            json.dump(data, fout, sort_keys=True, default=default_json)
+        dump_json(data, output)
         return
 
     matplotlib, pyplot = import_pyplot(args.backend, args.style)
 
     pyplot.stackplot(date_range_sampling, matrix, labels=labels)
     if args.relative:
-        for i in range(matrix.shape[1]):
-            matrix[:, i] /= matrix[:, i].sum()
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            matrix = matrix / matrix.sum(axis=0, keepdims=True)
+        numpy.nan_to_num(matrix, copy=False)
         pyplot.ylim(0, 1)
         legend_loc = 3
     else:
@@ -56,36 +72,29 @@ def plot_burndown(
     legend = pyplot.legend(loc=legend_loc, fontsize=args.font_size)
     pyplot.ylabel("Lines of code")
     pyplot.xlabel("Time")
+    ax = pyplot.gca()
     apply_plot_style(
-        pyplot.gcf(), pyplot.gca(), legend, args.background, args.font_size, args.size
+        pyplot.gcf(), ax, legend, args.background, args.font_size, args.size
     )
     pyplot.xlim(
         parse_date(args.start_date, date_range_sampling[0]),
         parse_date(args.end_date, date_range_sampling[-1]),
     )
-    locator = pyplot.gca().xaxis.get_major_locator()
-    # set the optimal xticks locator
-    if "M" not in resample:
-        pyplot.gca().xaxis.set_major_locator(matplotlib.dates.YearLocator())
-    locs = pyplot.gca().get_xticks().tolist()
-    if len(locs) >= 16:
-        pyplot.gca().xaxis.set_major_locator(matplotlib.dates.YearLocator())
-        locs = pyplot.gca().get_xticks().tolist()
-        if len(locs) >= 16:
-            pyplot.gca().xaxis.set_major_locator(locator)
-    if locs[0] < pyplot.xlim()[0]:
+    locs = get_time_ticks(ax, resample)
+    xlim_left, xlim_right = ax.get_xlim()
+    if locs[0] < xlim_left:
         del locs[0]
     endindex = -1
-    if len(locs) >= 2 and pyplot.xlim()[1] - locs[-1] > (locs[-1] - locs[-2]) / 2:
-        locs.append(pyplot.xlim()[1])
+    if len(locs) >= 2 and xlim_right - locs[-1] > (locs[-1] - locs[-2]) / 2:
+        locs.append(xlim_right)
         endindex = len(locs) - 1
     startindex = -1
-    if len(locs) >= 2 and locs[0] - pyplot.xlim()[0] > (locs[1] - locs[0]) / 2:
-        locs.append(pyplot.xlim()[0])
+    if len(locs) >= 2 and locs[0] - xlim_left > (locs[1] - locs[0]) / 2:
+        locs.append(xlim_left)
         startindex = len(locs) - 1
-    pyplot.gca().set_xticks(locs)
+    ax.set_xticks(locs)
     # hacking time!
-    labels = pyplot.gca().get_xticklabels()
+    labels = ax.get_xticklabels()
     if startindex >= 0:
         labels[startindex].set_text(date_range_sampling[0].date())
         labels[startindex].set_text = lambda _: None
@@ -114,42 +123,98 @@ def plot_many_burndown(args: Namespace, target: str, header, parts):
     if not args.output:
         print("Warning: output not set, showing %d plots." % len(parts))
     stdout = io.StringIO()
-    for name, matrix in tqdm.tqdm(parts):
-        with contextlib.redirect_stdout(stdout):
-            plot_burndown(
-                args, target, *load_burndown(header, name, matrix, args.resample)
+    jobs = ((header, name, matrix, args.resample) for name, matrix in parts)
+    parallel = len(parts) > 1 and (os.cpu_count() or 1) > 1
+    if parallel and args.output:
+        # nothing is shown, so the workers can render and save the plots as well
+        worker_args = Namespace(**vars(args))
+        worker_args.backend = "Agg"
+        with _process_pool() as executor:
+            outputs = executor.map(
+                _plot_burndown_captured, repeat(worker_args), repeat(target), jobs
             )
+            for output in tqdm.tqdm(outputs, total=len(parts)):
+                stdout.write(output)
+        sys.stdout.write(stdout.getvalue())
+        return
+    if parallel:
+        # the matrices are independent, resample them in parallel but plot in order
+        executor = _process_pool()
+        loaded = executor.map(_load_burndown_captured, jobs)
+    else:
+        executor = None
+        loaded = map(_load_burndown_captured, jobs)
+    try:
+        for burndown, output in tqdm.tqdm(loaded, total=len(parts)):
+            stdout.write(output)
+            with contextlib.redirect_stdout(stdout):
+                plot_burndown(args, target, *burndown)
+    finally:
+        if executor is not None:
+            executor.shutdown()
     sys.stdout.write(stdout.getvalue())
 
 
+def _process_pool() -> ProcessPoolExecutor:
+    # forking after the parallel Numba kernels ran in this process deadlocks at exit
+    return ProcessPoolExecutor(
+        mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    )
+
+
+def _init_worker() -> None:
+    # the workers already run in parallel, do not oversubscribe the CPUs
+    if njit is not None:
+        from numba import set_num_threads
+
+        set_num_threads(1)
+
+
+def _load_burndown_captured(job):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        burndown = load_burndown(*job)
+    return burndown, stdout.getvalue()
+
+
+def _plot_burndown_captured(args: Namespace, target: str, job) -> str:
+    burndown, output = _load_burndown_captured(job)
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        plot_burndown(args, target, *burndown)
+    return output + stdout.getvalue()
+
+
 def fit_kaplan_meier(matrix: numpy.ndarray) -> 'KaplanMeierFitter':
     from lifelines import KaplanMeierFitter
 
-    T = []
-    W = []
-    indexes = numpy.arange(matrix.shape[0], dtype=int)
-    entries = numpy.zeros(matrix.shape[0], int)
-    dead = set()
-    for i in range(1, matrix.shape[1]):
-        diff = matrix[:, i - 1] - matrix[:, i]
-        entries[diff < 0] = i
-        mask = diff > 0
-        deaths = diff[mask]
-        T.append(numpy.full(len(deaths), i) - entries[indexes[mask]])
-        W.append(deaths)
-        entered = entries > 0
-        entered[0] = True
-        dead = dead.union(set(numpy.where((matrix[:, i] == 0) & entered)[0]))
+    diffs = matrix[:, :-1] - matrix[:, 1:]
+    # entries[:, i] is the last sample up to i where the band grew, the sample indexes
+    # fit into int32
+    entries = numpy.zeros(matrix.shape, numpy.int32)
+    entries[:, 1:] = numpy.where(
+        diffs < 0, numpy.arange(1, matrix.shape[1], dtype=numpy.int32), 0
+    )
+    numpy.maximum.accumulate(entries, axis=1, out=entries)
+    entered = entries[:, 1:] > 0
+    entered[0] = True
+    dead = ((matrix[:, 1:] == 0) & entered).any(axis=1)
+    # the deaths ordered by sample
+    samples, bands = numpy.nonzero(diffs.T > 0)
+    T = [samples + 1 - entries[bands, samples + 1]]
+    W = [diffs[bands, samples]]
+    entries = entries[:, -1]
     # add the survivors as censored
     nnzind = entries != 0
     nnzind[0] = True
-    nnzind[sorted(dead)] = False
-    T.append(numpy.full(nnzind.sum(), matrix.shape[1]) - entries[nnzind])
+    nnzind &= ~dead
+    T.append(matrix.shape[1] - entries[nnzind])
     W.append(matrix[nnzind, -1])
-    T = numpy.concatenate(T)
+    # the sample indexes from numpy.nonzero() are int64
+    T = numpy.concatenate(T).astype(numpy.int32, copy=False)
     E = numpy.ones(len(T), bool)
     E[-nnzind.sum() :] = 0
-    W = numpy.concatenate(W)
+    W = numpy.concatenate(W).astype(numpy.float32)
     if T.size == 0:
         return None
     kmf = KaplanMeierFitter().fit(T, E, weights=W)
@@ -161,14 +226,193 @@ def print_survival_function(kmf: 'KaplanMeierFitter', sampling: int) -> None:
     sf.index = [timedelta(days=d) for d in sf.index * sampling]
     sf.columns = ["Ratio of survived lines"]
     try:
-        print(sf[len(sf) // 6 :: len(sf) // 6].append(sf.tail(1)))
+        print(import_pandas().concat([sf[len(sf) // 6 :: len(sf) // 6], sf.tail(1)]))
     except ValueError:
         pass
 
 
+def _decay(
+    daily: numpy.ndarray,
+    yg: int,
+    yg1: int,
+    xs1: int,
+    start_index: int,
+    start_val: float,
+    finish_val: float,
+) -> None:
+    if start_val == 0:
+        return
+    k = finish_val / start_val  # <= 1
+    scale = xs1 - start_index
+    # fill the whole tile at once: each row decays linearly from its initial value
+    ramp = 1 + (k - 1) * numpy.arange(1, scale + 1) / scale
+    daily[yg:yg1, start_index:xs1] = daily[yg:yg1, start_index - 1 : start_index] * ramp
+
+
+def _grow(
+    daily: numpy.ndarray,
+    yg: int,
+    xs: int,
+    finish_index: int,
+    initial: float,
+    finish_val: float,
+) -> None:
+    start_index = xs
+    if start_index < yg:
+        start_index = yg
+    if finish_index == start_index:
+        return
+    avg = (finish_val - initial) / (finish_index - start_index)
+    for j in range(xs, finish_index):
+        daily[start_index : j + 1, j] = avg
+    # copy [x*g..y*s)
+    if xs > yg:
+        daily[yg:xs, xs:finish_index] = daily[yg:xs, xs - 1 : xs]
+
+
+def _interpolate_peaks(
+    matrix: numpy.ndarray, granularity: int, sampling: int
+) -> numpy.ndarray:
+    """
+    Calculate the peak values of the bands which end in the middle of a sample
+    (y*sampling <= (x+1)*granularity < (y+1)*sampling) for all the bands and samples
+    at once. The values for the rest of the cells are meaningless.
+    """
+    yg = numpy.arange(matrix.shape[0])[:, numpy.newaxis] * granularity
+    yg1 = yg + granularity
+    x = numpy.arange(matrix.shape[1])[numpy.newaxis, :]
+    xs = x * sampling
+    xs1 = xs + sampling
+    # matrix[y, x - 1] wraps around at x = 0, the same as the former scalar code
+    v1 = numpy.roll(matrix, 1, axis=1)
+    v2 = matrix
+    # x*g <= (y-1)*s <= y*s <= (x+1)*g <= (y+1)*s
+    #           |________|.......^
+    # otherwise
+    # (y-1)*s < x*g <= y*s <= (x+1)*g <= (y+1)*s
+    #            |______|.......^
+    full = (x > 0) & (xs - sampling >= yg)
+    previous = numpy.where(full & (x > 1), numpy.roll(matrix, 2, axis=1), 0)
+    scale = numpy.where(full | (x == 0), sampling, xs - yg)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        peaks = v1 + (v1 - previous) / scale * (yg1 - xs)
+        # we need to adjust the peak, it may not be less than the decayed value
+        # y*s <= (x+1)*g <= (y+1)*s < (y+2)*s
+        #           ^.........|_________|
+        # peak > v2 > v1
+        # on the last sample there is not enough data to interpolate; v2 is at least
+        # not restricted
+        adjusted = numpy.where(
+            x < matrix.shape[1] - 1,
+            v2 + (v2 - numpy.roll(matrix, -1, axis=1)) / sampling * (xs1 - yg1),
+            v2,
+        )
+    return numpy.where(v2 > peaks, adjusted, peaks)
+
+
+def _interpolate_band(
+    daily: numpy.ndarray,
+    matrix: numpy.ndarray,
+    peaks: numpy.ndarray,
+    y: int,
+    granularity: int,
+    sampling: int,
+) -> None:
+    """
+    Fill the rows of the day x day matrix which belong to band `y`. The bands never
+    write outside of their own rows, so they can be interpolated independently.
+    """
+    yg = y * granularity
+    yg1 = yg + granularity
+    for x in range(matrix.shape[1]):
+        xs = x * sampling
+        xs1 = xs + sampling
+        if yg > xs1:
+            # the future is zeros
+            continue
+        initial = matrix[y, x - 1] if x > 0 else 0
+        if yg1 >= xs1:
+            # x*granularity <= (y+1)*sampling
+            # 1. x*granularity <= y*sampling
+            #    y*sampling..(y+1)sampling
+            #
+            #       x+1
+            #        /
+            #       /
+            #      / y+1  -|
+            #     /        |
+            #    / y      -|
+            #   /
+            #  / x
+            #
+            # 2. x*granularity > y*sampling
+            #    x*granularity..(y+1)sampling
+            #
+            #       x+1
+            #        /
+            #       /
+            #      / y+1  -|
+            #     /        |
+            #    / x      -|
+            #   /
+            #  / y
+            if yg <= xs:
+                _grow(daily, yg, xs, xs1, initial, matrix[y, x])
+            elif xs1 > yg:
+                _grow(daily, yg, xs, xs1, initial, matrix[y, x])
+                avg = matrix[y, x] / (xs1 - yg)
+                # the upper triangle including the diagonal
+                for i in range(yg, xs1):
+                    daily[i, i:xs1] = avg
+        elif yg1 >= xs:
+            # y*sampling <= (x+1)*granularity < (y+1)sampling
+            # y*sampling..(x+1)*granularity
+            # (x+1)*granularity..(y+1)sampling
+            #        x+1
+            #         /\
+            #        /  \
+            #       /    \
+            #      /    y+1
+            #     /
+            #    y
+            peak = peaks[y, x]
+            _grow(daily, yg, xs, yg1, initial, peak)
+            _decay(daily, yg, yg1, xs1, yg1, peak, matrix[y, x])
+        else:
+            # (x+1)*granularity < y*sampling
+            # y*sampling..(y+1)sampling
+            _decay(daily, yg, yg1, xs1, xs, matrix[y, x - 1], matrix[y, x])
+
+
+def _interpolate_bands(
+    daily: numpy.ndarray,
+    matrix: numpy.ndarray,
+    peaks: numpy.ndarray,
+    granularity: int,
+    sampling: int,
+    first_band: int,
+    last_band: int,
+) -> None:
+    for y in prange(first_band, last_band):
+        _interpolate_band(daily, matrix, peaks, y, granularity, sampling)
+
+
+if njit is not None:
+    # error_model="numpy" keeps the inf/nan results of the zero divisions instead of raising
+    _decay = njit(cache=True, error_model="numpy")(_decay)
+    _grow = njit(cache=True, error_model="numpy")(_grow)
+    _interpolate_band = njit(cache=True, error_model="numpy")(_interpolate_band)
+    _interpolate_bands = njit(cache=True, error_model="numpy", parallel=True)(
+        _interpolate_bands
+    )
+
+
 def interpolate_burndown_matrix(
     matrix: numpy.ndarray, granularity: int, sampling: int, progress: bool = False
 ) -> numpy.ndarray:
+    if granularity == 1 and sampling == 1:
+        # every band and every sample is already a single day
+        return matrix.astype(numpy.float32)
     daily = numpy.zeros(
         (matrix.shape[0] * granularity, matrix.shape[1] * sampling), dtype=numpy.float32
     )
@@ -180,121 +424,54 @@ def interpolate_burndown_matrix(
     ⌄
     bands, y
     """
-    for y in tqdm.tqdm(range(matrix.shape[0]), disable=(not progress)):
-        for x in range(matrix.shape[1]):
-            if y * granularity > (x + 1) * sampling:
-                # the future is zeros
-                continue
-
-            def decay(start_index: int, start_val: float):
-                if start_val == 0:
-                    return
-                k = matrix[y][x] / start_val  # <= 1
-                scale = (x + 1) * sampling - start_index
-                for i in range(y * granularity, (y + 1) * granularity):
-                    initial = daily[i][start_index - 1]
-                    for j in range(start_index, (x + 1) * sampling):
-                        daily[i][j] = initial * (
-                            1 + (k - 1) * (j - start_index + 1) / scale
-                        )
-
-            def grow(finish_index: int, finish_val: float):
-                initial = matrix[y][x - 1] if x > 0 else 0
-                start_index = x * sampling
-                if start_index < y * granularity:
-                    start_index = y * granularity
-                if finish_index == start_index:
-                    return
-                avg = (finish_val - initial) / (finish_index - start_index)
-                for j in range(x * sampling, finish_index):
-                    for i in range(start_index, j + 1):
-                        daily[i][j] = avg
-                # copy [x*g..y*s)
-                for j in range(x * sampling, finish_index):
-                    for i in range(y * granularity, x * sampling):
-                        daily[i][j] = daily[i][j - 1]
-
-            if (y + 1) * granularity >= (x + 1) * sampling:
-                # x*granularity <= (y+1)*sampling
-                # 1. x*granularity <= y*sampling
-                #    y*sampling..(y+1)sampling
-                #
-                #       x+1
-                #        /
-                #       /
-                #      / y+1  -|
-                #     /        |
-                #    / y      -|
-                #   /
-                #  / x
-                #
-                # 2. x*granularity > y*sampling
-                #    x*granularity..(y+1)sampling
-                #
-                #       x+1
-                #        /
-                #       /
-                #      / y+1  -|
-                #     /        |
-                #    / x      -|
-                #   /
-                #  / y
-                if y * granularity <= x * sampling:
-                    grow((x + 1) * sampling, matrix[y][x])
-                elif (x + 1) * sampling > y * granularity:
-                    grow((x + 1) * sampling, matrix[y][x])
-                    avg = matrix[y][x] / ((x + 1) * sampling - y * granularity)
-                    for j in range(y * granularity, (x + 1) * sampling):
-                        for i in range(y * granularity, j + 1):
-                            daily[i][j] = avg
-            elif (y + 1) * granularity >= x * sampling:
-                # y*sampling <= (x+1)*granularity < (y+1)sampling
-                # y*sampling..(x+1)*granularity
-                # (x+1)*granularity..(y+1)sampling
-                #        x+1
-                #         /\
-                #        /  \
-                #       /    \
-                #      /    y+1
-                #     /
-                #    y
-                v1 = matrix[y][x - 1]
-                v2 = matrix[y][x]
-                delta = (y + 1) * granularity - x * sampling
-                previous = 0
-                if x > 0 and (x - 1) * sampling >= y * granularity:
-                    # x*g <= (y-1)*s <= y*s <= (x+1)*g <= (y+1)*s
-                    #           |________|.......^
-                    if x > 1:
-                        previous = matrix[y][x - 2]
-                    scale = sampling
-                else:
-                    # (y-1)*s < x*g <= y*s <= (x+1)*g <= (y+1)*s
-                    #            |______|.......^
-                    scale = sampling if x == 0 else x * sampling - y * granularity
-                peak = v1 + (v1 - previous) / scale * delta
-                if v2 > peak:
-                    # we need to adjust the peak, it may not be less than the decayed value
-                    if x < matrix.shape[1] - 1:
-                        # y*s <= (x+1)*g <= (y+1)*s < (y+2)*s
-                        #           ^.........|_________|
-                        k = (v2 - matrix[y][x + 1]) / sampling  # > 0
-                        peak = matrix[y][x] + k * (
-                            (x + 1) * sampling - (y + 1) * granularity
-                        )
-                        # peak > v2 > v1
-                    else:
-                        peak = v2
-                        # not enough data to interpolate; this is at least not restricted
-                grow((y + 1) * granularity, peak)
-                decay((y + 1) * granularity, peak)
-            else:
-                # (x+1)*granularity < y*sampling
-                # y*sampling..(y+1)sampling
-                decay(x * sampling, matrix[y][x - 1])
+    # the readers return transposed views; row-major inputs let Numba compile plain
+    # `i * width + j` addressing instead of the generic strided one
+    matrix = numpy.ascontiguousarray(matrix)
+    peaks = _interpolate_peaks(matrix, granularity, sampling)
+    # interpolate in blocks of bands to keep all the cores busy with Numba and still be able
+    # to report the progress
+    block = os.cpu_count() or 1
+    with tqdm.tqdm(total=matrix.shape[0], disable=(not progress)) as pb:
+        for first_band in range(0, matrix.shape[0], block):
+            last_band = min(first_band + block, matrix.shape[0])
+            _interpolate_bands(
+                daily, matrix, peaks, granularity, sampling, first_band, last_band
+            )
+            pb.update(last_band - first_band)
     return daily
 
 
+def _sum_daily_bands(
+    daily: numpy.ndarray,
+    band_ends: numpy.ndarray,
+    offset: int,
+    width: int,
+    last_day: int,
+) -> numpy.ndarray:
+    """
+    Sum the rows of the interpolated day x day matrix between consecutive band ends
+    with a single numpy.add.reduceat() call. The columns are taken from `offset` on.
+    The rows starting from `last_day` are ignored: no lines were written after it.
+    """
+    band_ends = numpy.minimum(
+        numpy.asarray(band_ends, dtype=int), min(daily.shape[0], last_day)
+    )
+    band_starts = numpy.concatenate(([0], band_ends[:-1]))
+    result = numpy.zeros((len(band_ends), width), dtype=numpy.float32)
+    nonempty = band_starts < band_ends
+    if nonempty.any():
+        # reduceat() returns the single row instead of zeros for empty slices
+        result[nonempty] = numpy.add.reduceat(
+            daily[: band_ends[-1], offset : offset + width],
+            band_starts[nonempty],
+            axis=0,
+        )
+    # the bands do not exist before they are born
+    days = numpy.arange(offset, offset + width)
+    result[days[numpy.newaxis, :] < band_starts[:, numpy.newaxis]] = 0
+    return result
+
+
 def load_burndown(
     header: Tuple[int, int, int, int, float],
     name: str,
@@ -308,7 +485,7 @@ def load_burndown(
     start, last, sampling, granularity, tick = header
     assert sampling > 0
     assert granularity > 0
-    start = floor_datetime(datetime.fromtimestamp(start), tick)
+    start = floor_timestamp(start, tick)
     last = datetime.fromtimestamp(last)
     if report_survival:
         kmf = fit_kaplan_meier(matrix)
@@ -326,16 +503,17 @@ def load_burndown(
             sampling=sampling,
             progress=interpolation_progress,
         )
-        daily[(last - start).days :] = 0
         # Resample the bands
         aliases = {"year": "A", "month": "M", "day": "D"}
         resample = aliases.get(resample, resample)
-        periods = 0
-        date_granularity_sampling = [start]
-        while date_granularity_sampling[-1] < finish:
-            periods += 1
+        # the periods until the finish, plus the one which covers it
+        date_granularity_sampling = pandas.date_range(start, finish, freq=resample)
+        if (
+            len(date_granularity_sampling) == 0
+            or date_granularity_sampling[-1] < finish
+        ):
             date_granularity_sampling = pandas.date_range(
-                start, periods=periods, freq=resample
+                start, periods=len(date_granularity_sampling) + 1, freq=resample
             )
         if date_granularity_sampling[0] > finish:
             if resample == "A":
@@ -356,18 +534,13 @@ def load_burndown(
             freq="1D",
         )
         # Fill the new square matrix
-        matrix = numpy.zeros(
-            (len(date_granularity_sampling), len(date_range_sampling)),
-            dtype=numpy.float32,
+        matrix = _sum_daily_bands(
+            daily,
+            numpy.asarray((date_granularity_sampling - start).days),
+            (date_range_sampling[0] - start).days,
+            len(date_range_sampling),
+            (last - start).days,
         )
-        for i, gdt in enumerate(date_granularity_sampling):
-            istart = (date_granularity_sampling[i - 1] - start).days if i > 0 else 0
-            ifinish = (gdt - start).days
-
-            for j, sdt in enumerate(date_range_sampling):
-                if (sdt - start).days >= istart:
-                    break
-            matrix[i, j:] = daily[istart:ifinish, (sdt - start).days :].sum(axis=0)
         # Hardcode some cases to improve labels' readability
         if resample in ("year", "A"):
             labels = [dt.year for dt in date_granularity_sampling]
@@ -376,14 +549,9 @@ def load_burndown(
         else:
             labels = [dt.date() for dt in date_granularity_sampling]
     else:
-        labels = [
-            "%s - %s"
-            % (
-                (start + timedelta(seconds=i * granularity * tick)).date(),
-                (start + timedelta(seconds=(i + 1) * granularity * tick)).date(),
-            )
-            for i in range(matrix.shape[0])
-        ]
+        band = timedelta(seconds=granularity * tick)
+        dates = [(start + i * band).date() for i in range(matrix.shape[0] + 1)]
+        labels = ["%s - %s" % (dates[i], dates[i + 1]) for i in range(matrix.shape[0])]
         if len(labels) > 18:
             warnings.warn("Too many labels - consider resampling.")
         resample = "M"  # fake resampling type is checked while plotting
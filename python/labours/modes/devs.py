@@ -1,6 +1,7 @@
 from argparse import Namespace
 from collections import defaultdict
 from datetime import datetime, timedelta
+import heapq
 import sys
 from typing import Dict, List, Set, Tuple
 
@@ -11,6 +12,13 @@ from labours.objects import DevDay
 from labours.plotting import apply_plot_style, deploy_plot, get_plot_path, import_pyplot
 from labours.utils import _format_number
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # order_commits falls back to fastdtw
+    njit = None
+    prange = range
+
 
 def show_devs(
     args: Namespace,
@@ -26,12 +34,22 @@ def show_devs(
     if len(people) > max_people:
         print("Picking top %s developers by commit count" % max_people)
         # pick top N developers by commit count
-        commits = defaultdict(int)
-        for devs in days.values():
-            for dev, stats in devs.items():
-                commits[dev] += stats.Commits
-        commits = sorted(((v, k) for k, v in commits.items()), reverse=True)
-        chosen_people = {people[k] for _, k in commits[:max_people]}
+        dev_index, dev_commits = (
+            numpy.array(
+                [
+                    (dev, stats.Commits)
+                    for devs in days.values()
+                    for dev, stats in devs.items()
+                ],
+                dtype=numpy.int64,
+            )
+            .reshape(-1, 2)
+            .T
+        )
+        dev_ids, dev_index = numpy.unique(dev_index, return_inverse=True)
+        commits = numpy.bincount(dev_index, weights=dev_commits).astype(numpy.int64)
+        top = heapq.nlargest(max_people, zip(commits.tolist(), dev_ids.tolist()))
+        chosen_people = {people[k] for _, k in top}
     else:
         chosen_people = set(people)
     dists, devseries, devstats, route = order_commits(chosen_people, days, people)
@@ -50,13 +68,22 @@ def show_devs(
     plot_x = [start_date + timedelta(days=i) for i in range(size)]
     resolution = 64
     window = slepian(size // resolution, 0.5)
+    rows, days_index, counts = (
+        numpy.array(
+            [
+                (route_map[i], day, count)
+                for i, s in enumerate(devseries.values())
+                for day, count in s
+            ],
+            dtype=numpy.int64,
+        )
+        .reshape(-1, 3)
+        .T
+    )
+    inside = days_index < size
     final = numpy.zeros((len(devseries), size), dtype=numpy.float32)
-    for i, s in enumerate(devseries.values()):
-        arr = numpy.array(s).transpose()
-        full_history = numpy.zeros(size, dtype=numpy.float32)
-        mask = arr[0] < size
-        full_history[arr[0][mask]] = arr[1][mask]
-        final[route_map[i]] = convolve(full_history, window, "same")
+    final[rows[inside], days_index[inside]] = counts[inside]
+    final[:] = convolve(final, window[numpy.newaxis, :], "same", method="direct")
 
     matplotlib, pyplot = import_pyplot(args.backend, args.style)
     pyplot.rcParams["figure.figsize"] = (32, 16)
@@ -71,18 +98,19 @@ def show_devs(
     backgrounds = (
         ("#C4FFDB", "#FFD0CD") if args.background == "white" else ("#05401C", "#40110E")
     )
+    text_color = "black" if args.background == "white" else "white"
     max_cluster = numpy.max(clusters)
-    for ax, series, cluster, dev_i in zip(axes, final, clusters, route):
-        if cluster >= 0:
-            color = colors[cluster % len(colors)]
-            i = 1
-            while color == "#777777":
-                color = colors[(max_cluster + i) % len(colors)]
-                i += 1
-        else:
-            # outlier
-            color = "#777777"
-        ax.fill_between(plot_x, series, color=color)
+    # outliers are grey, and so must never be the clusters
+    cluster_colors = {-1: "#777777"}
+    for cluster in numpy.unique(clusters[clusters >= 0]).tolist():
+        color = colors[cluster % len(colors)]
+        i = 1
+        while color == "#777777":
+            color = colors[(max_cluster + i) % len(colors)]
+            i += 1
+        cluster_colors[cluster] = color
+    for ax, series, cluster, dev_i in zip(axes, final, clusters.tolist(), route):
+        ax.fill_between(plot_x, series, color=cluster_colors[cluster])
         ax.set_axis_off()
         author = people[dev_i]
         ax.text(
@@ -93,7 +121,7 @@ def show_devs(
             verticalalignment="center",
             transform=ax.transAxes,
             fontsize=args.font_size,
-            color="black" if args.background == "white" else "white",
+            color=text_color,
         )
         ds = devstats[dev_i]
         stats = "%5d %8s %8s" % (
@@ -111,7 +139,7 @@ def show_devs(
             fontsize=args.font_size,
             family="monospace",
             backgroundcolor=backgrounds[ds[1] <= ds[2]],
-            color="black" if args.background == "white" else "white",
+            color=text_color,
         )
     axes[0].text(
         0.97,
@@ -122,7 +150,7 @@ def show_devs(
         transform=axes[0].transAxes,
         fontsize=args.font_size,
         family="monospace",
-        color="black" if args.background == "white" else "white",
+        color=text_color,
     )
     axes[-1].set_axis_on()
     target_num_labels = 12
@@ -141,8 +169,7 @@ def show_devs(
             matplotlib.dates.MonthLocator(interval=interval)
         )
         axes[-1].xaxis.set_major_formatter(matplotlib.dates.DateFormatter("%Y-%m"))
-    for tick in axes[-1].xaxis.get_major_ticks():
-        tick.label.set_fontsize(args.font_size)
+    axes[-1].tick_params(axis="x", labelsize=args.font_size)
     axes[-1].spines["left"].set_visible(False)
     axes[-1].spines["right"].set_visible(False)
     axes[-1].spines["top"].set_visible(False)
@@ -162,24 +189,26 @@ def order_commits(
 ) -> Tuple[numpy.ndarray, defaultdict, defaultdict, List[int]]:
     from seriate import seriate
 
-    try:
-        from fastdtw import fastdtw
-    except ImportError as e:
-        print(
-            "Cannot import fastdtw: %s\nInstall it from https://github.com/slaypni/fastdtw"
-            % e
-        )
-        sys.exit(1)
-    # FIXME(vmarkovtsev): remove once https://github.com/slaypni/fastdtw/pull/28 is merged&released
-    try:
-        sys.modules[
-            "fastdtw.fastdtw"
-        ].__norm = lambda p: lambda a, b: numpy.linalg.norm(
-            numpy.atleast_1d(a) - numpy.atleast_1d(b), p
-        )
-    except KeyError:
-        # the native extension does not have this bug
-        pass
+    if njit is None:
+        try:
+            from fastdtw import fastdtw
+        except ImportError as e:
+            print(
+                "Cannot import fastdtw: %s\nInstall it from https://github.com/slaypni/fastdtw"
+                % e
+            )
+            sys.exit(1)
+        # FIXME(vmarkovtsev): remove once
+        # https://github.com/slaypni/fastdtw/pull/28 is merged&released
+        try:
+            sys.modules[
+                "fastdtw.fastdtw"
+            ].__norm = lambda p: lambda a, b: numpy.linalg.norm(
+                numpy.atleast_1d(a) - numpy.atleast_1d(b), p
+            )
+        except KeyError:
+            # the native extension does not have this bug
+            pass
 
     devseries = defaultdict(list)
     devstats = defaultdict(lambda: DevDay(0, 0, 0, 0, {}))
@@ -189,34 +218,191 @@ def order_commits(
                 devseries[dev].append((day, stats.Commits))
                 devstats[dev] = devstats[dev].add(stats)
     print("Calculating the distance matrix")
-    # max-normalize the time series using a sliding window
+    # normalize the time series so that the commits of each developer sum to 1
     series = list(devseries.values())
     for i, s in enumerate(series):
-        arr = numpy.array(s).transpose().astype(numpy.float32)
-        arr[1] /= arr[1].sum()
-        series[i] = arr.transpose()
+        arr = numpy.array(s, dtype=numpy.float32)
+        arr[:, 1] /= arr[:, 1].sum()
+        series[i] = arr
     # calculate the distance matrix using dynamic time warping
     dists = numpy.full((len(series),) * 2, -100500, dtype=numpy.float32)
-    # TODO: what's the total for this progress bar?
-    with tqdm.tqdm() as pb:
-        for x, serx in enumerate(series):
-            dists[x, x] = 0
-            for y, sery in enumerate(series[x + 1 :], start=x + 1):
-                min_day = int(min(serx[0][0], sery[0][0]))
-                max_day = int(max(serx[-1][0], sery[-1][0]))
-                arrx = numpy.zeros(max_day - min_day + 1, dtype=numpy.float32)
-                arry = numpy.zeros_like(arrx)
-                arrx[serx[:, 0].astype(int) - min_day] = serx[:, 1]
-                arry[sery[:, 0].astype(int) - min_day] = sery[:, 1]
-                # L1 norm
-                dist, _ = fastdtw(arrx, arry, radius=5, dist=1)
-                dists[x, y] = dists[y, x] = dist
-                pb.update()
+    with tqdm.tqdm(total=len(series) * (len(series) - 1) // 2) as pb:
+        if njit is not None:
+            days_flat, commits_flat, offsets = _flatten_series(series)
+            for x in range(len(series)):
+                dists[x, x] = 0
+                _dtw_distances_row(x, days_flat, commits_flat, offsets, dists)
+                pb.update(len(series) - x - 1)
+        else:
+            # zero-padded scratch buffers over the whole day span, reused by all the pairs
+            first_day = min((int(s[0][0]) for s in series), default=0)
+            last_day = max((int(s[-1][0]) for s in series), default=0)
+            arrx = numpy.zeros(last_day - first_day + 1, dtype=numpy.float32)
+            arry = numpy.zeros_like(arrx)
+            for x, serx in enumerate(series):
+                dists[x, x] = 0
+                indx = serx[:, 0].astype(int) - first_day
+                arrx[indx] = serx[:, 1]
+                for y, sery in enumerate(series[x + 1 :], start=x + 1):
+                    min_day = int(min(serx[0][0], sery[0][0])) - first_day
+                    max_day = int(max(serx[-1][0], sery[-1][0])) - first_day
+                    indy = sery[:, 0].astype(int) - first_day
+                    arry[indy] = sery[:, 1]
+                    # L1 norm
+                    dist, _ = fastdtw(
+                        arrx[min_day : max_day + 1],
+                        arry[min_day : max_day + 1],
+                        radius=5,
+                        dist=1,
+                    )
+                    arry[indy] = 0
+                    dists[x, y] = dists[y, x] = dist
+                    pb.update()
+                arrx[indx] = 0
     print("Ordering the series")
     route = seriate(dists)
     return dists, devseries, devstats, route
 
 
+def _flatten_series(
+    series: List[numpy.ndarray],
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    offsets = numpy.zeros(len(series) + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(s) for s in series])
+    if series:
+        flat = numpy.concatenate(series)
+    else:
+        flat = numpy.zeros((0, 2), dtype=numpy.float32)
+    return flat[:, 0].astype(numpy.int64), flat[:, 1].copy(), offsets
+
+
+def _reduce_by_half(x: numpy.ndarray) -> numpy.ndarray:
+    half = numpy.empty(len(x) // 2)
+    for i in range(len(half)):
+        half[i] = (x[2 * i] + x[2 * i + 1]) / 2
+    return half
+
+
+def _dtw(
+    x: numpy.ndarray, y: numpy.ndarray, lo: numpy.ndarray, hi: numpy.ndarray
+) -> Tuple[float, numpy.ndarray, numpy.ndarray]:
+    """
+    Calculate the L1 dynamic time warping inside the window which spans
+    y[lo[i]:hi[i] + 1] for each x[i]. Return the distance and the warping path.
+    """
+    offsets = numpy.zeros(len(x) + 1, dtype=numpy.int64)
+    for i in range(len(x)):
+        offsets[i + 1] = offsets[i] + hi[i] - lo[i] + 1
+    cost = numpy.empty(offsets[-1])
+    steps = numpy.empty(offsets[-1], dtype=numpy.uint8)
+    for i in range(len(x)):
+        for j in range(lo[i], hi[i] + 1):
+            dt = abs(x[i] - y[j])
+            up = left = diag = numpy.inf
+            if i > 0:
+                if lo[i - 1] <= j <= hi[i - 1]:
+                    up = cost[offsets[i - 1] + j - lo[i - 1]]
+                if lo[i - 1] < j <= hi[i - 1] + 1:
+                    diag = cost[offsets[i - 1] + j - 1 - lo[i - 1]]
+            elif j == 0:
+                diag = 0.0
+            if j > lo[i]:
+                left = cost[offsets[i] + j - 1 - lo[i]]
+            # resolve the ties in the same order as fastdtw does
+            best, step = up + dt, 0
+            if left + dt < best:
+                best, step = left + dt, 1
+            if diag + dt < best:
+                best, step = diag + dt, 2
+            cost[offsets[i] + j - lo[i]] = best
+            steps[offsets[i] + j - lo[i]] = step
+    path_x = numpy.empty(len(x) + len(y), dtype=numpy.int64)
+    path_y = numpy.empty_like(path_x)
+    i, j, size = len(x) - 1, len(y) - 1, 0
+    while i >= 0 and j >= 0:
+        path_x[size] = i
+        path_y[size] = j
+        size += 1
+        step = steps[offsets[i] + j - lo[i]]
+        if step != 1:
+            i -= 1
+        if step != 0:
+            j -= 1
+    return cost[-1], path_x[size - 1 :: -1], path_y[size - 1 :: -1]
+
+
+def _expand_window(
+    path_x: numpy.ndarray, path_y: numpy.ndarray, len_x: int, len_y: int, radius: int
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Project the warping path of the twice shrunk series to the window of the full ones.
+    """
+    # the path visits every row and never goes back, so the window rows are contiguous
+    rows = path_x[-1] + 1
+    first = numpy.full(rows, len_y, dtype=numpy.int64)
+    last = numpy.zeros(rows, dtype=numpy.int64)
+    for k in range(len(path_x)):
+        first[path_x[k]] = min(first[path_x[k]], path_y[k])
+        last[path_x[k]] = max(last[path_x[k]], path_y[k])
+    lo = numpy.empty(len_x, dtype=numpy.int64)
+    hi = numpy.empty(len_x, dtype=numpy.int64)
+    for i in range(len_x):
+        row = i // 2
+        lo[i] = max(0, 2 * (first[max(0, row - radius)] - radius))
+        hi[i] = min(len_y - 1, 2 * (last[min(rows - 1, row + radius)] + radius) + 1)
+    return lo, hi
+
+
+def _fastdtw(x: numpy.ndarray, y: numpy.ndarray, radius: int) -> float:
+    """
+    Port of fastdtw(x, y, radius=radius, dist=1) which returns the same distance.
+    """
+    xs, ys = [x], [y]
+    while len(xs[-1]) >= radius + 2 and len(ys[-1]) >= radius + 2:
+        xs.append(_reduce_by_half(xs[-1]))
+        ys.append(_reduce_by_half(ys[-1]))
+    x, y = xs.pop(), ys.pop()
+    lo = numpy.zeros(len(x), dtype=numpy.int64)
+    hi = numpy.full(len(x), len(y) - 1, dtype=numpy.int64)
+    distance, path_x, path_y = _dtw(x, y, lo, hi)
+    while len(xs) > 0:
+        x, y = xs.pop(), ys.pop()
+        lo, hi = _expand_window(path_x, path_y, len(x), len(y), radius)
+        distance, path_x, path_y = _dtw(x, y, lo, hi)
+    return distance
+
+
+def _dtw_distances_row(
+    x: int,
+    days: numpy.ndarray,
+    commits: numpy.ndarray,
+    offsets: numpy.ndarray,
+    dists: numpy.ndarray,
+) -> None:
+    begin_x, end_x = offsets[x], offsets[x + 1]
+    for y in prange(x + 1, len(offsets) - 1):
+        begin_y, end_y = offsets[y], offsets[y + 1]
+        min_day = min(days[begin_x], days[begin_y])
+        max_day = max(days[end_x - 1], days[end_y - 1])
+        arrx = numpy.zeros(max_day - min_day + 1)
+        arry = numpy.zeros(max_day - min_day + 1)
+        for i in range(begin_x, end_x):
+            arrx[days[i] - min_day] = commits[i]
+        for i in range(begin_y, end_y):
+            arry[days[i] - min_day] = commits[i]
+        distance = _fastdtw(arrx, arry, 5)
+        dists[x, y] = distance
+        dists[y, x] = distance
+
+
+if njit is not None:
+    _reduce_by_half = njit(cache=True)(_reduce_by_half)
+    _dtw = njit(cache=True)(_dtw)
+    _expand_window = njit(cache=True)(_expand_window)
+    _fastdtw = njit(cache=True)(_fastdtw)
+    _dtw_distances_row = njit(cache=True, parallel=True)(_dtw_distances_row)
+
+
 def hdbscan_cluster_routed_series(
     dists: numpy.ndarray, route: List[int]
 ) -> numpy.ndarray:
@@ -226,10 +412,10 @@ def hdbscan_cluster_routed_series(
         print("Cannot import hdbscan: %s" % e)
         sys.exit(1)
 
-    opt_dist_chain = numpy.cumsum(
-        numpy.array(
-            [0] + [dists[route[i], route[i + 1]] for i in range(len(route) - 1)]
-        )
+    route = numpy.asarray(route, dtype=numpy.intp)
+    opt_dist_chain = numpy.zeros(len(route))
+    numpy.cumsum(
+        dists[route[:-1], route[1:]], dtype=opt_dist_chain.dtype, out=opt_dist_chain[1:]
     )
     if len(route) < 2:
         clusters = numpy.zeros(len(route), dtype=int)
@@ -254,16 +440,32 @@ def show_devs_efforts(
     end_date = datetime.fromtimestamp(end_date)
     end_date = datetime(end_date.year, end_date.month, end_date.day)
 
-    efforts_by_dev = defaultdict(int)
-    for day, devs in days.items():
-        for dev, stats in devs.items():
-            efforts_by_dev[dev] += stats.Added + stats.Removed + stats.Changed
+    # flatten the daily stats once and accumulate them with numpy
+    day_index, dev_index, changes = (
+        numpy.array(
+            [
+                (day, dev, stats.Added + stats.Removed + stats.Changed)
+                for day, devs in days.items()
+                for dev, stats in devs.items()
+            ],
+            dtype=numpy.int64,
+        )
+        .reshape(-1, 3)
+        .T
+    )
+    dev_ids, dev_index = numpy.unique(dev_index, return_inverse=True)
+    efforts_by_dev = dict(
+        zip(
+            dev_ids.tolist(),
+            numpy.bincount(dev_index, weights=changes).astype(numpy.int64).tolist(),
+        )
+    )
     if len(efforts_by_dev) > max_people:
         chosen = {
-            v
-            for k, v in sorted(
-                ((v, k) for k, v in efforts_by_dev.items()), reverse=True
-            )[:max_people]
+            k
+            for _, k in heapq.nlargest(
+                max_people, ((v, k) for k, v in efforts_by_dev.items())
+            )
         }
         print("Warning: truncated people to the most active %d" % max_people)
     else:
@@ -271,22 +473,29 @@ def show_devs_efforts(
     chosen_efforts = sorted(((efforts_by_dev[k], k) for k in chosen), reverse=True)
     chosen_order = {k: i for i, (_, k) in enumerate(chosen_efforts)}
 
-    efforts = numpy.zeros(
-        (len(chosen) + 1, (end_date - start_date).days + 1), dtype=numpy.float32
+    shape = (len(chosen) + 1, (end_date - start_date).days + 1)
+    rows = numpy.array(
+        [chosen_order.get(dev, len(chosen_order)) for dev in dev_ids.tolist()],
+        dtype=numpy.int64,
+    )
+    inside = day_index < shape[1]
+    efforts = (
+        numpy.bincount(
+            rows[dev_index[inside]] * shape[1] + day_index[inside],
+            weights=changes[inside],
+            minlength=shape[0] * shape[1],
+        )
+        .astype(numpy.float32)
+        .reshape(shape)
     )
-    for day, devs in days.items():
-        if day < efforts.shape[1]:
-            for dev, stats in devs.items():
-                dev = chosen_order.get(dev, len(chosen_order))
-                efforts[dev][day] += stats.Added + stats.Removed + stats.Changed
     efforts_cum = numpy.cumsum(efforts, axis=1)
     window = slepian(10, 0.5)
     window /= window.sum()
     for e in (efforts, efforts_cum):
-        for i in range(e.shape[0]):
-            ending = e[i][-len(window) * 2 :].copy()
-            e[i] = convolve(e[i], window, "same")
-            e[i][-len(ending) :] = ending
+        # smooth all the rows at once but keep their endings intact
+        ending = e[:, -len(window) * 2 :].copy()
+        e[:] = convolve(e, window[numpy.newaxis, :], "same", method="direct")
+        e[:, -ending.shape[1] :] = ending
     matplotlib, pyplot = import_pyplot(args.backend, args.style)
     plot_x = [start_date + timedelta(days=i) for i in range(efforts.shape[1])]
 
@@ -1,4 +1,5 @@
 from collections import defaultdict
+import heapq
 import sys
 from typing import Any, Dict, List, Tuple
 
@@ -32,30 +33,43 @@ def load_devs_parallel(
     _, days = devs
 
     print("calculating - commits")
+    # walk the days once for both the commits and the changed lines
+    dev_index, dev_commits, dev_lines = (
+        numpy.array(
+            [
+                (dev, stats.Commits, stats.Added + stats.Removed + stats.Changed)
+                for devs in days.values()
+                for dev, stats in devs.items()
+            ],
+            dtype=numpy.int64,
+        )
+        .reshape(-1, 3)
+        .T
+    )
+    dev_ids, dev_index = numpy.unique(dev_index, return_inverse=True)
     commits = defaultdict(int)
-    for day, devs in days.items():
-        for dev, stats in devs.items():
-            commits[people[dev]] += stats.Commits
+    lines = defaultdict(int)
+    for dev, dc, dl in zip(
+        dev_ids.tolist(),
+        numpy.bincount(dev_index, weights=dev_commits).astype(numpy.int64).tolist(),
+        numpy.bincount(dev_index, weights=dev_lines).astype(numpy.int64).tolist(),
+    ):
+        commits[people[dev]] += dc
+        lines[people[dev]] += dl
     chosen = [
-        k
-        for v, k in sorted(((v, k) for k, v in commits.items()), reverse=True)[
-            :max_people
-        ]
+        k for v, k in heapq.nlargest(max_people, ((v, k) for k, v in commits.items()))
     ]
+    chosen_pos = {k: i for i, k in enumerate(chosen)}
     result = {k: ParallelDevData() for k in chosen}
     for k, v in result.items():
-        v.commits_rank = chosen.index(k)
+        v.commits_rank = chosen_pos[k]
         v.commits = commits[k]
 
     print("calculating - lines")
-    lines = defaultdict(int)
-    for day, devs in days.items():
-        for dev, stats in devs.items():
-            lines[people[dev]] += stats.Added + stats.Removed + stats.Changed
     lines_index = {
         k: i
         for i, (_, k) in enumerate(
-            sorted(((v, k) for k, v in lines.items() if k in chosen), reverse=True)
+            sorted(((v, k) for k, v in lines.items() if k in chosen_pos), reverse=True)
         )
     }
     for k, v in result.items():
@@ -74,49 +88,49 @@ def load_devs_parallel(
         v.ownership = owned[k][-1].sum()
 
     print("calculating - couples")
+    # the first occurrence of each name, like people.index()
+    people_pos = {}
+    for i, k in enumerate(people):
+        people_pos.setdefault(k, i)
     embeddings = numpy.genfromtxt(fname="couples_people_data.tsv", delimiter="\t")[
-        [people.index(k) for k in chosen]
+        [people_pos[k] for k in chosen]
     ]
     embeddings /= numpy.linalg.norm(embeddings, axis=1)[:, None]
     cos = embeddings.dot(embeddings.T)
-    cos[cos > 1] = 1  # tiny precision faults
-    dists = numpy.arccos(cos)
+    numpy.clip(cos, -1, 1, out=cos)  # tiny precision faults
+    # the angles are also seriated, so keep them rather than 1 - cos
+    dists = numpy.arccos(cos, out=cos)
     clusters = HDBSCAN(min_cluster_size=2, metric="precomputed").fit_predict(dists)
     for k, v in result.items():
-        v.couples_cluster = clusters[chosen.index(k)]
+        v.couples_cluster = clusters[chosen_pos[k]]
 
     couples_order = seriate(dists)
-    roll_options = []
-    for i in range(len(couples_order)):
-        loss = 0
-        for k, v in result.items():
-            loss += abs(
-                v.ownership_rank
-                - (couples_order.index(chosen.index(k)) + i) % len(chosen)
-            )
-        roll_options.append(loss)
+    # the position of each chosen developer in the order, and the loss of every roll
+    couples_pos = numpy.argsort(couples_order)[[chosen_pos[k] for k in result]]
+    ranks = numpy.array([v.ownership_rank for v in result.values()])
+    rolls = numpy.arange(len(couples_order))[:, numpy.newaxis]
+    roll_options = numpy.abs(ranks - (couples_pos + rolls) % len(chosen)).sum(axis=1)
     best_roll = numpy.argmin(roll_options)
-    couples_order = list(numpy.roll(couples_order, best_roll))
-    for k, v in result.items():
-        v.couples_index = couples_order.index(chosen.index(k))
+    couples_pos = ((couples_pos + best_roll) % len(chosen)).tolist()
+    for v, i in zip(result.values(), couples_pos):
+        v.couples_index = i
 
     print("calculating - commit series")
-    dists, devseries, _, orig_route = order_commits(chosen, days, people)
+    dists, devseries, _, orig_route = order_commits(set(chosen), days, people)
     keys = list(devseries.keys())
-    route = [keys[node] for node in orig_route]
-    for roll in range(len(route)):
-        loss = 0
-        for k, v in result.items():
-            i = route.index(people.index(k))
-            loss += abs(v.couples_index - ((i + roll) % len(route)))
-        roll_options[roll] = loss
+    dev_route_pos = {keys[node]: i for i, node in enumerate(orig_route)}
+    route_pos = numpy.array([dev_route_pos[people_pos[k]] for k in result])
+    indexes = numpy.array([v.couples_index for v in result.values()])
+    size = len(orig_route)
+    rolls = numpy.arange(size)[:, numpy.newaxis]
+    roll_options = numpy.abs(indexes - (route_pos + rolls) % size).sum(axis=1)
     best_roll = numpy.argmin(roll_options)
-    route = list(numpy.roll(route, best_roll))
     orig_route = list(numpy.roll(orig_route, best_roll))
     clusters = hdbscan_cluster_routed_series(dists, orig_route)
-    for k, v in result.items():
-        v.commit_coocc_index = route.index(people.index(k))
-        v.commit_coocc_cluster = clusters[v.commit_coocc_index]
+    route_pos = ((route_pos + best_roll) % size).tolist()
+    for v, i in zip(result.values(), route_pos):
+        v.commit_coocc_index = i
+        v.commit_coocc_cluster = clusters[i]
 
     return result
 
@@ -147,15 +161,14 @@ def show_devs_parallel(args, name, start_date, end_date, devs):
             dtype=float,
         )
         points[:, 1] = points[:, 1] / len(devs)
-        splines = []
-        for i in range(len(points) - 1):
-            a, b, c, d = solve_equations(*points[i], *points[i + 1])
-            x = numpy.linspace(i + 1, i + 2, 100)
-            smooth_points = numpy.array(
-                [x, a * x ** 3 + b * x ** 2 + c * x + d]
-            ).T.reshape(-1, 1, 2)
-            splines.append(smooth_points)
-        points = numpy.concatenate(splines)
+        # solve and sample all the spline segments at once
+        a, b, c, d = (
+            coeffs[:, numpy.newaxis]
+            for coeffs in solve_equations(*points[:-1].T, *points[1:].T)
+        )
+        x = numpy.linspace(points[:-1, 0], points[1:, 0], 100, axis=1)
+        y = a * x ** 3 + b * x ** 2 + c * x + d
+        points = numpy.stack([x, y], axis=-1).reshape(-1, 1, 2)
         segments = numpy.concatenate([points[:-1], points[1:]], axis=1)
         lc = LineCollection(segments)
         lc.set_array(numpy.linspace(0, 0.1, segments.shape[0]))
@@ -1,9 +1,6 @@
 from argparse import Namespace
-from collections import defaultdict
 from typing import Dict, List
 
-import numpy
-
 from labours.objects import DevDay
 
 
@@ -15,18 +12,20 @@ def show_languages(
     people: List[str],
     days: Dict[int, Dict[int, DevDay]],
 ) -> None:
-    devlangs = defaultdict(lambda: defaultdict(lambda: numpy.zeros(3, dtype=int)))
-    for day, devs in days.items():
+    # only the totals of added, removed and changed lines are reported
+    devlangs = {}
+    for devs in days.values():
         for dev, stats in devs.items():
+            if not stats.Languages:
+                continue
+            langs = devlangs.setdefault(dev, {})
             for lang, vals in stats.Languages.items():
-                devlangs[dev][lang] += vals
-    devlangs = sorted(
-        devlangs.items(), key=lambda p: -sum(x.sum() for x in p[1].values())
-    )
+                langs[lang] = langs.get(lang, 0) + sum(vals)
+    devlangs = sorted(devlangs.items(), key=lambda p: -sum(p[1].values()))
     for dev, ls in devlangs:
         print()
         print("#", people[dev])
-        ls = sorted(((vals.sum(), lang) for lang, vals in ls.items()), reverse=True)
+        ls = sorted(((vals, lang) for lang, vals in ls.items()), reverse=True)
         for vals, lang in ls:
             if lang:
                 print("%s: %d" % (lang, vals))
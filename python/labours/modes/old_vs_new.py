@@ -1,6 +1,5 @@
 from argparse import Namespace
 from datetime import datetime, timedelta
-from itertools import chain
 from typing import Dict, List
 
 import numpy
@@ -23,12 +22,21 @@ def show_old_vs_new(
     start_date = datetime(start_date.year, start_date.month, start_date.day)
     end_date = datetime.fromtimestamp(end_date)
     end_date = datetime(end_date.year, end_date.month, end_date.day)
-    new_lines = numpy.zeros((end_date - start_date).days + 2)
-    old_lines = numpy.zeros_like(new_lines)
-    for day, devs in days.items():
-        for stats in devs.values():
-            new_lines[day] += stats.Added
-            old_lines[day] += stats.Removed + stats.Changed
+    size = (end_date - start_date).days + 2
+    day_index, added, changed = (
+        numpy.array(
+            [
+                (day, stats.Added, stats.Removed + stats.Changed)
+                for day, devs in days.items()
+                for stats in devs.values()
+            ],
+            dtype=numpy.int64,
+        )
+        .reshape(-1, 3)
+        .T
+    )
+    new_lines = numpy.bincount(day_index, weights=added, minlength=size)
+    old_lines = numpy.bincount(day_index, weights=changed, minlength=size)
     resolution = 32
     window = slepian(max(len(new_lines) // resolution, 1), 0.5)
     new_lines = convolve(new_lines, window, "same")
@@ -40,10 +48,7 @@ def show_old_vs_new(
         plot_x, old_lines, color="#E14C35", label="Changed existing lines"
     )
     pyplot.legend(loc=2, fontsize=args.font_size)
-    for tick in chain(
-        pyplot.gca().xaxis.get_major_ticks(), pyplot.gca().yaxis.get_major_ticks()
-    ):
-        tick.label.set_fontsize(args.font_size)
+    pyplot.gca().tick_params(labelsize=args.font_size)
     if args.mode == "all" and args.output:
         output = get_plot_path(args.output, "old_vs_new")
     else:
@@ -1,17 +1,18 @@
-import json
 
 import numpy
 
 from labours.plotting import apply_plot_style, deploy_plot, get_plot_path, import_pyplot
-from labours.utils import default_json
+from labours.utils import dump_json
 
 
 def load_overwrites_matrix(people, matrix, max_people, normalize=True):
     matrix = matrix.astype(float)
     if matrix.shape[0] > max_people:
-        order = numpy.argsort(-matrix[:, 0])
-        matrix = matrix[order[:max_people]][:, [0, 1] + list(2 + order[:max_people])]
-        people = [people[i] for i in order[:max_people]]
+        # only the most productive people need to be sorted
+        order = numpy.argpartition(-matrix[:, 0], max_people - 1)[:max_people]
+        order = order[numpy.argsort(-matrix[order, 0])]
+        matrix = matrix[order][:, [0, 1] + list(2 + order)]
+        people = [people[i] for i in order]
         print("Warning: truncated people to most productive %d" % max_people)
     if normalize:
         zeros = matrix[:, 0] == 0
@@ -34,8 +35,7 @@ def plot_overwrites_matrix(args, repo, people, matrix):
             output = get_plot_path(args.output, "matrix")
         else:
             output = args.output
-        with open(output, "w") as fout:
-            json.dump(data, fout, sort_keys=True, default=default_json)
+        dump_json(data, output)
         return
 
     matplotlib, pyplot = import_pyplot(args.backend, args.style)
@@ -1,11 +1,10 @@
 from datetime import datetime, timedelta
-import json
 from typing import Any, Dict, List, Tuple
 
 import numpy
 
 from labours.plotting import apply_plot_style, deploy_plot, get_plot_path, import_pyplot
-from labours.utils import default_json, floor_datetime, import_pandas, parse_date
+from labours.utils import dump_json, floor_timestamp, import_pandas, parse_date
 
 
 def load_ownership(
@@ -18,8 +17,7 @@ def load_ownership(
     pandas = import_pandas()
 
     start, last, sampling, _, tick = header
-    start = datetime.fromtimestamp(start)
-    start = floor_datetime(start, tick)
+    start = floor_timestamp(start, tick)
     last = datetime.fromtimestamp(last)
     people = []
     for name in sequence:
@@ -66,8 +64,7 @@ def plot_ownership(args, repo, names, people, date_range, last):
             output = get_plot_path(args.output, "people")
         else:
             output = args.output
-        with open(output, "w") as fout:
-            json.dump(data, fout, sort_keys=True, default=default_json)
+        dump_json(data, output)
         return
 
     matplotlib, pyplot = import_pyplot(args.backend, args.style)
@@ -80,8 +77,9 @@ def plot_ownership(args, repo, names, people, date_range, last):
     )
 
     if args.relative:
-        for i in range(people.shape[1]):
-            people[:, i] /= people[:, i].sum()
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            people = people / people.sum(axis=0, keepdims=True)
+        numpy.nan_to_num(people, copy=False)
         pyplot.ylim(0, 1)
         legend_loc = 3
     else:
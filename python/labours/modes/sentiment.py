@@ -2,7 +2,13 @@ from datetime import datetime, timedelta
 
 import numpy
 
-from labours.plotting import apply_plot_style, deploy_plot, get_plot_path, import_pyplot
+from labours.plotting import (
+    apply_plot_style,
+    deploy_plot,
+    get_plot_path,
+    get_time_ticks,
+    import_pyplot,
+)
 from labours.utils import parse_date
 
 
@@ -44,16 +50,7 @@ def show_sentiment_stats(args, name, resample, start_date, data):
         parse_date(args.start_date, timeline[0]),
         parse_date(args.end_date, timeline[-1]),
     )
-    locator = pyplot.gca().xaxis.get_major_locator()
-    # set the optimal xticks locator
-    if "M" not in resample:
-        pyplot.gca().xaxis.set_major_locator(matplotlib.dates.YearLocator())
-    locs = pyplot.gca().get_xticks().tolist()
-    if len(locs) >= 16:
-        pyplot.gca().xaxis.set_major_locator(matplotlib.dates.YearLocator())
-        locs = pyplot.gca().get_xticks().tolist()
-        if len(locs) >= 16:
-            pyplot.gca().xaxis.set_major_locator(locator)
+    locs = get_time_ticks(pyplot.gca(), resample)
     if locs[0] < pyplot.xlim()[0]:
         del locs[0]
     endindex = -1
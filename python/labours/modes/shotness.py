@@ -1,5 +1,12 @@
+import numpy
+
+
 def show_shotness_stats(data):
-    top = sorted(((r.counters[i], i) for i, r in enumerate(data)), reverse=True)
-    for count, i in top:
+    counts = numpy.fromiter(
+        (r.counters[i] for i, r in enumerate(data)), numpy.int64, len(data)
+    )
+    # descending by count, then by index, like sorting (count, index) pairs in reverse
+    top = numpy.argsort(counts, kind="stable")[::-1]
+    for i in top.tolist():
         r = data[i]
-        print("%8d  %s:%s [%s]" % (count, r.file, r.name, r.internal_role))
+        print("%8d  %s:%s [%s]" % (counts[i], r.file, r.name, r.internal_role))
@@ -1,23 +1,30 @@
-from collections import defaultdict, namedtuple
+from collections import namedtuple
+
+# added, removed, changed
+NO_LANGUAGE_STATS = (0, 0, 0)
 
 
 class DevDay(
     namedtuple("DevDay", ("Commits", "Added", "Removed", "Changed", "Languages"))
 ):
     def add(self, dd: 'DevDay') -> 'DevDay':
-        langs = defaultdict(lambda: [0] * 3)
-        for key, val in self.Languages.items():
-            for i in range(3):
-                langs[key][i] += val[i]
-        for key, val in dd.Languages.items():
-            for i in range(3):
-                langs[key][i] += val[i]
+        mine, theirs = self.Languages, dd.Languages
+        # merging the dicts keeps the order of the languages
+        langs = {
+            key: [
+                a + b
+                for a, b in zip(
+                    mine.get(key, NO_LANGUAGE_STATS), theirs.get(key, NO_LANGUAGE_STATS)
+                )
+            ]
+            for key in {**mine, **theirs}
+        }
         return DevDay(
             Commits=self.Commits + dd.Commits,
             Added=self.Added + dd.Added,
             Removed=self.Removed + dd.Removed,
             Changed=self.Changed + dd.Changed,
-            Languages=dict(langs),
+            Languages=langs,
         )
 
 
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import List
 
 
 def import_pyplot(backend, style):
@@ -9,7 +10,14 @@ def import_pyplot(backend, style):
         matplotlib.use(backend)
     from matplotlib import pyplot
 
-    pyplot.style.use(style)
+    try:
+        pyplot.style.use(style)
+    except OSError:
+        styles = sorted(set(pyplot.style.available) - {"classic"})
+        raise ValueError(
+            "Unknown plot style: %s. Choose one of: %s"
+            % (style, ", ".join(["default", "classic"] + styles))
+        ) from None
     print("matplotlib: backend is", matplotlib.get_backend())
     return matplotlib, pyplot
 
@@ -42,6 +50,24 @@ def apply_plot_style(figure, axes, legend, background, font_size, axes_size):
             text.set_color(foreground)
 
 
+def get_time_ticks(axes, resample: str) -> List[float]:
+    """
+    Choose the x ticks of a time series plot: years unless the series is resampled by
+    month, and years anyway if there would be too many month ticks.
+    """
+    import matplotlib.dates
+
+    # evaluate the year locator without installing it on the axis
+    year_locator = matplotlib.dates.YearLocator()
+    year_locator.set_axis(axes.xaxis)
+    if "M" not in resample:
+        return year_locator().tolist()
+    locs = axes.get_xticks().tolist()
+    if len(locs) >= 16:
+        locs = year_locator().tolist()
+    return locs
+
+
 def get_plot_path(base: str, name: str) -> str:
     root, ext = os.path.splitext(base)
     if not ext:
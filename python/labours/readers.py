@@ -61,19 +61,23 @@ class Reader(object):
         raise NotImplementedError
 
 
+yaml.reader.Reader.NON_PRINTABLE = re.compile(r"(?!x)x")
+try:
+    YAML_LOADER = yaml.CSafeLoader
+except AttributeError:
+    YAML_LOADER = yaml.SafeLoader
+
+
 class YamlReader(Reader):
     def read(self, fileobj: BinaryIO):
-        yaml.reader.Reader.NON_PRINTABLE = re.compile(r"(?!x)x")
-        try:
-            loader = yaml.CLoader
-        except AttributeError:
+        if YAML_LOADER is yaml.SafeLoader:
             print(
-                "Warning: failed to import yaml.CLoader, falling back to slow yaml.Loader"
+                "Warning: failed to import yaml.CSafeLoader, "
+                "falling back to slow yaml.SafeLoader"
             )
-            loader = yaml.Loader
         try:
             wrapper = io.TextIOWrapper(fileobj, encoding="utf-8")
-            data = yaml.load(wrapper, Loader=loader)
+            data = yaml.load(wrapper, Loader=YAML_LOADER)
         except (UnicodeEncodeError, UnicodeDecodeError, yaml.reader.ReaderError) as e:
             print(
                 "\nInvalid unicode in the input: %s\nPlease filter it through "
@@ -144,20 +148,23 @@ class YamlReader(Reader):
         shotness = self.data["Shotness"]
         index = ["%s:%s" % (i["file"], i["name"]) for i in shotness]
         indptr = numpy.zeros(len(shotness) + 1, dtype=numpy.int64)
-        indices = []
-        data = []
+        numpy.cumsum(
+            [len(record["counters"]) for record in shotness],
+            dtype=numpy.int64,
+            out=indptr[1:],
+        )
+        indices = numpy.empty(indptr[-1], dtype=numpy.int32)
+        data = numpy.empty(indptr[-1], dtype=numpy.int32)
         for i, record in enumerate(shotness):
-            pairs = [(int(k), v) for k, v in record["counters"].items()]
-            pairs.sort()
-            indptr[i + 1] = indptr[i] + len(pairs)
-            for k, v in pairs:
-                indices.append(k)
-                data.append(v)
-        indices = numpy.array(indices, dtype=numpy.int32)
-        data = numpy.array(data, dtype=numpy.int32)
+            counters = record["counters"]
+            indices[indptr[i] : indptr[i + 1]] = [int(k) for k in counters]
+            data[indptr[i] : indptr[i + 1]] = list(counters.values())
         from scipy.sparse import csr_matrix
 
-        return index, csr_matrix((data, indices, indptr), shape=(len(shotness),) * 2)
+        matrix = csr_matrix((data, indices, indptr), shape=(len(shotness),) * 2)
+        # the counters are not ordered
+        matrix.sort_indices()
+        return index, matrix
 
     def get_shotness(self):
         from munch import munchify
@@ -196,22 +203,25 @@ class YamlReader(Reader):
         return people, days
 
     def _parse_burndown_matrix(self, matrix):
-        return numpy.array(
-            [numpy.fromstring(line, dtype=int, sep=" ") for line in matrix.split("\n")]
+        # the matrix is rectangular and the whitespace separator matches the newlines
+        return numpy.fromstring(matrix, dtype=int, sep=" ").reshape(
+            matrix.count("\n") + 1, -1
         )
 
     def _parse_coocc_matrix(self, matrix):
         from scipy.sparse import csr_matrix
 
-        data = []
-        indices = []
-        indptr = [0]
-        for row in matrix:
-            for k, v in sorted(row.items()):
-                data.append(v)
-                indices.append(k)
-            indptr.append(indptr[-1] + len(row))
-        return csr_matrix((data, indices, indptr), shape=(len(matrix),) * 2)
+        indptr = numpy.zeros(len(matrix) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(row) for row in matrix], dtype=numpy.int64, out=indptr[1:])
+        indices = numpy.empty(indptr[-1], dtype=numpy.int32)
+        data = numpy.empty(indptr[-1], dtype=numpy.int64)
+        for i, row in enumerate(matrix):
+            indices[indptr[i] : indptr[i + 1]] = list(row.keys())
+            data[indptr[i] : indptr[i + 1]] = list(row.values())
+        coocc = csr_matrix((data, indices, indptr), shape=(len(matrix),) * 2)
+        # the rows are not ordered
+        coocc.sort_indices()
+        return coocc
 
 
 class ProtobufReader(Reader):
@@ -290,20 +300,23 @@ class ProtobufReader(Reader):
         shotness = self.get_shotness()
         index = ["%s:%s" % (i.file, i.name) for i in shotness]
         indptr = numpy.zeros(len(shotness) + 1, dtype=numpy.int32)
-        indices = []
-        data = []
+        numpy.cumsum(
+            [len(record.counters) for record in shotness],
+            dtype=numpy.int32,
+            out=indptr[1:],
+        )
+        indices = numpy.empty(indptr[-1], dtype=numpy.int32)
+        data = numpy.empty(indptr[-1], dtype=numpy.int32)
         for i, record in enumerate(shotness):
-            pairs = list(record.counters.items())
-            pairs.sort()
-            indptr[i + 1] = indptr[i] + len(pairs)
-            for k, v in pairs:
-                indices.append(k)
-                data.append(v)
-        indices = numpy.array(indices, dtype=numpy.int32)
-        data = numpy.array(data, dtype=numpy.int32)
+            counters = record.counters
+            indices[indptr[i] : indptr[i + 1]] = list(counters.keys())
+            data[indptr[i] : indptr[i + 1]] = list(counters.values())
         from scipy.sparse import csr_matrix
 
-        return index, csr_matrix((data, indices, indptr), shape=(len(shotness),) * 2)
+        matrix = csr_matrix((data, indices, indptr), shape=(len(shotness),) * 2)
+        # the counters are not ordered
+        matrix.sort_indices()
+        return index, matrix
 
     def get_shotness(self):
         records = self.contents["Shotness"].records
@@ -342,15 +355,19 @@ class ProtobufReader(Reader):
             (matrix.number_of_rows, matrix.number_of_columns), dtype=int
         )
         for y, row in enumerate(matrix.rows):
-            for x, col in enumerate(row.columns):
-                dense[y, x] = col
+            # the trailing zeros are not serialized
+            dense[y, : len(row.columns)] = row.columns
         return matrix.name, dense.T
 
     def _parse_sparse_matrix(self, matrix):
         from scipy.sparse import csr_matrix
 
         return csr_matrix(
-            (list(matrix.data), list(matrix.indices), list(matrix.indptr)),
+            (
+                numpy.fromiter(matrix.data, numpy.int64, len(matrix.data)),
+                numpy.fromiter(matrix.indices, numpy.int32, len(matrix.indices)),
+                numpy.fromiter(matrix.indptr, numpy.int64, len(matrix.indptr)),
+            ),
             shape=(matrix.number_of_rows, matrix.number_of_columns),
         )
 
@@ -1,4 +1,6 @@
 from datetime import datetime
+from functools import lru_cache
+import json
 from numbers import Number
 from typing import TYPE_CHECKING
 
@@ -9,7 +11,11 @@ if TYPE_CHECKING:
 
 
 def floor_datetime(dt: datetime, duration: float) -> datetime:
-    return datetime.fromtimestamp(dt.timestamp() - dt.timestamp() % duration)
+    return floor_timestamp(dt.timestamp(), duration)
+
+
+def floor_timestamp(ts: float, duration: float) -> datetime:
+    return datetime.fromtimestamp(ts - ts % duration)
 
 
 def default_json(x):
@@ -20,6 +26,26 @@ def default_json(x):
     return x
 
 
+def dump_json(data: dict, path: str) -> None:
+    try:
+        import orjson
+    except ImportError:
+        with open(path, "w") as fout:
+            json.dump(data, fout, sort_keys=True, default=default_json)
+        return
+    # orjson serializes the contiguous numpy arrays straight from their buffers
+    with open(path, "wb") as fout:
+        fout.write(
+            orjson.dumps(
+                data,
+                default=default_json,
+                option=orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_SORT_KEYS
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        )
+
+
 def parse_date(text: None, default: 'Timestamp') -> 'Timestamp':
     if not text:
         return default
@@ -56,6 +82,7 @@ def _format_number(n: Number) -> str:
     return n + suffix
 
 
+@lru_cache(maxsize=1)
 def import_pandas():
     import pandas
 